@@ -1,3 +1,8 @@
+import re
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 
@@ -56,52 +61,386 @@ def build_types(df: pd.DataFrame):
 # -----------------------------------------------------
 # LOAD CARDS
 # -----------------------------------------------------
-@st.cache_data(ttl=300)
-def load_cards():
-    try:
-        df = pd.read_csv(CARDS_SHEET_URL)
+def prepare_cards(df):
+    # Normalize column names
+    df.columns = df.columns.str.lower().str.replace(" ", "_")
 
-        # Normalize column names
-        df.columns = df.columns.str.lower().str.replace(" ", "_")
+    # Rename to match the app logic
+    df = df.rename(columns={
+        "card_sell": "sell_price",
+        "market_raw": "price"     # Market Raw → price
+    })
 
-        # Rename to match the app logic
-        df = df.rename(columns={
-            "card_sell": "sell_price",
-            "market_raw": "price"     # Market Raw → price
-        })
+    df["price"] = df["price"].apply(clean_price)
+    df["sell_price"] = df["sell_price"].apply(clean_price)
 
-        df["price"] = df["price"].apply(clean_price)
-        df["sell_price"] = df["sell_price"].apply(clean_price)
+    return df
 
-        return df
+@st.cache_data(ttl=300)
+def load_cards():
+    try:
+        return prepare_cards(pd.read_csv(CARDS_SHEET_URL))
     except Exception as e:
         st.error(f"Error loading cards: {e}")
         return pd.DataFrame()
 
+# -----------------------------------------------------
+# PARSE GRADE
+# -----------------------------------------------------
+# Label-only grades (no number on the slab string) per grading company.
+# The same label means different grades across brands: "Gem Mint" is a
+# PSA 10 but a BGS/CGC 9.5. Unknown brands fall back to the PSA scale.
+GRADE_LABELS = {
+    "PSA": {
+        "GEM MINT": 10.0,
+        "GEM MT": 10.0,
+        "MINT": 9.0,
+        "NM-MT": 8.0,
+        "NM": 7.0,
+        "EX-MT": 6.0,
+        "EX": 5.0,
+        "VG-EX": 4.0,
+        "VG": 3.0,
+        "GOOD": 2.0,
+        "FAIR": 1.5,
+        "POOR": 1.0,
+    },
+    "BGS": {
+        "BLACK LABEL": 10.0,
+        "PRISTINE": 10.0,
+        "GEM MINT": 9.5,
+        "GEM MT": 9.5,
+        "MINT": 9.0,
+        "NM-MT+": 8.5,
+        "NM-MT": 8.0,
+        "NM+": 7.5,
+        "NM": 7.0,
+        "EX-MT": 6.0,
+        "EX": 5.0,
+    },
+    "CGC": {
+        "PERFECT": 10.0,
+        "PRISTINE": 10.0,
+        "GEM MINT": 9.5,
+        "GEM MT": 9.5,
+        "MINT+": 9.5,
+        "MINT": 9.0,
+        "NM-MT+": 8.5,
+        "NM-MT": 8.0,
+        "NM+": 7.5,
+        "NM": 7.0,
+        "EX-MT": 6.0,
+        "EX": 5.0,
+    },
+}
+GRADE_BRAND_ALIASES = {"BECKETT": "BGS"}
+GRADE_NUMBER = re.compile(r"(?<![\d.,])(\d{1,2}(?:[.,]\d)?)(?![\d.,])")
+# PSA qualifiers: off-center, stain, print defect, out of focus,
+# marks, miscut
+GRADE_QUALIFIER = re.compile(r"\b(OC|ST|PD|OF|MK|MC)\b")
+
+
+def _grade_brand(brand, text):
+    # Brand column first, then a brand named in the grade string itself
+    for source in ["" if pd.isna(brand) else str(brand).upper(), text]:
+        for name in list(GRADE_LABELS) + list(GRADE_BRAND_ALIASES):
+            if re.search(rf"\b{name}\b", source):
+                return GRADE_BRAND_ALIASES.get(name, name)
+    return "PSA"
+
+
+def parse_grade(value, brand=None):
+    """Numeric grade from a slab string ("PSA 10", "BGS 9.5", "MINT 9 OC"), or NaN."""
+    if pd.isna(value):
+        return np.nan
+    text = str(value).upper()
+
+    match = GRADE_NUMBER.search(text)
+    if match:
+        return min(float(match.group(1).replace(",", ".")), 10.0)
+
+    # Longest label first so "GEM MINT" wins over "MINT" and "NM-MT+" over "NM-MT"
+    labels = GRADE_LABELS[_grade_brand(brand, text)]
+    for label in sorted(labels, key=len, reverse=True):
+        if re.search(rf"(?<![\w-]){re.escape(label)}(?![\w+-])", text):
+            return labels[label]
+
+    # "Authentic", "Altered", blanks, ...
+    return np.nan
+
+
+def parse_grade_qualifier(value):
+    if pd.isna(value):
+        return ""
+    match = GRADE_QUALIFIER.search(str(value).upper())
+    return match.group(1) if match else ""
+
 # -----------------------------------------------------
 # LOAD SLABS
 # -----------------------------------------------------
-@st.cache_data(ttl=300)
-def load_slabs():
-    try:
-        df = pd.read_csv(SLABS_SHEET_URL)
+def prepare_slabs(df):
+    # Normalize names
+    df.columns = df.columns.str.lower().str.replace(" ", "_")
+
+    df = df.rename(columns={
+        "price": "price",
+        "sell_price": "sell_price"
+    })
 
-        # Normalize names
-        df.columns = df.columns.str.lower().str.replace(" ", "_")
+    df["price"] = df["price"].apply(clean_price)
+    df["sell_price"] = df["sell_price"].apply(clean_price)
 
-        df = df.rename(columns={
-            "price": "price",
-            "sell_price": "sell_price"
-        })
+    # Parse once here so filters and sorts work on numbers
+    df["grade_num"] = [
+        parse_grade(grade, brand) for grade, brand in zip(df["cardgrade"], df["brand"])
+    ]
+    df["grade_qualifier"] = df["cardgrade"].apply(parse_grade_qualifier)
 
-        df["price"] = df["price"].apply(clean_price)
-        df["sell_price"] = df["sell_price"].apply(clean_price)
+    return df
 
-        return df
+@st.cache_data(ttl=300)
+def load_slabs():
+    try:
+        return prepare_slabs(pd.read_csv(SLABS_SHEET_URL))
     except Exception as e:
         st.error(f"Error loading slabs: {e}")
         return pd.DataFrame()
 
+# -----------------------------------------------------
+# SLAB INDEX (SORTED GRADE + PRICE)
+# -----------------------------------------------------
+SLAB_INDEX_COLUMNS = ["grade_num", "sell_price"]
+
+
+@st.cache_resource(ttl=300)
+def build_slab_index(slabs_df):
+    """Sorted values + row positions per column, so range filters are binary searches."""
+    index = {}
+    for col in SLAB_INDEX_COLUMNS:
+        values = pd.to_numeric(slabs_df[col], errors="coerce").to_numpy(dtype=float)
+        order = np.argsort(values, kind="stable")
+        missing = np.isnan(values[order])
+        rank = np.empty(len(order), dtype=int)
+        rank[order] = np.arange(len(order))
+        index[col] = {
+            "values": values[order][~missing],
+            "order": order[~missing],
+            "missing": order[missing],
+            "row_values": values,
+            "rank": rank,
+        }
+    return index
+
+
+def range_positions(index, col, low, high):
+    """Row positions with low <= value <= high, in ascending value order."""
+    entry = index[col]
+    start = np.searchsorted(entry["values"], low, side="left")
+    end = np.searchsorted(entry["values"], high, side="right")
+    return entry["order"][start:end]
+
+
+def _in_range(index, col, positions, low, high):
+    values = index[col]["row_values"][positions]
+    return positions[(values >= low) & (values <= high)]
+
+
+def slab_positions(index, ranges, full_ranges, sort_col, descending):
+    """
+    Row positions matching every narrowed range, ordered by `sort_col`.
+    Columns left at their full range are not filtered, so rows without
+    a parsed grade or price still show (after the sorted rows).
+    """
+    narrowed = [col for col in SLAB_INDEX_COLUMNS if ranges[col] != full_ranges[col]]
+
+    positions = range_positions(index, sort_col, *ranges[sort_col])
+    for col in narrowed:
+        if col == sort_col:
+            continue
+        # Intersect the two range slices by checking the smaller one
+        # against the other column's range
+        candidates = range_positions(index, col, *ranges[col])
+        if len(candidates) < len(positions):
+            candidates = _in_range(index, sort_col, candidates, *ranges[sort_col])
+            positions = candidates[np.argsort(index[sort_col]["rank"][candidates], kind="stable")]
+        else:
+            positions = _in_range(index, col, positions, *ranges[col])
+
+    if descending:
+        positions = positions[::-1]
+    if sort_col not in narrowed:
+        missing = index[sort_col]["missing"]
+        for col in narrowed:
+            missing = _in_range(index, col, missing, *ranges[col])
+        positions = np.concatenate([positions, missing])
+
+    return positions
+
+# -----------------------------------------------------
+# SEARCH INDEX (RAW CARDS + SLABS)
+# -----------------------------------------------------
+# Field weights used when scoring a token hit; a match on the card
+# name / slab subject outranks a match on its set or grade.
+SEARCH_FIELD_WEIGHTS = {"title": 3, "set": 2, "brand": 1, "grade": 1, "cardgrade": 1, "type": 1}
+SEARCH_FACETS = ["set", "grade"]
+
+
+def normalize_text(value):
+    if pd.isna(value):
+        return ""
+    # Fold accents so "Pokémon" and "pokemon" share a token
+    text = unicodedata.normalize("NFKD", str(value))
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def tokenize(value):
+    return normalize_text(value).split()
+
+
+def _field(value, default=""):
+    if pd.isna(value) or str(value).strip() == "":
+        return default
+    return str(value).strip()
+
+
+def _price(value):
+    price = clean_price(value)
+    return 0.0 if pd.isna(price) else price
+
+
+def _grade_facet(slab):
+    # "PSA 10", "PSA 10 GEM MT" and "GEM MT 10" should share one facet
+    # value, so facet on brand + parsed grade rather than the raw string
+    brand = _field(slab.get("brand"))
+    grade = slab.get("grade_num")
+    if grade is None or pd.isna(grade):
+        grade = parse_grade(slab.get("cardgrade"), brand)
+    label = _field(slab.get("cardgrade"), "N/A") if pd.isna(grade) else f"{grade:g}"
+    return " ".join(filter(None, [brand, label]))
+
+
+def _image(value):
+    if isinstance(value, str) and value.strip():
+        return value
+    return "https://via.placeholder.com/150"
+
+
+@st.cache_resource(ttl=300)
+def build_search_index(cards_df, slabs_df):
+    items = []
+
+    if cards_df is not None and not cards_df.empty:
+        for card in cards_df.to_dict("records"):
+            items.append({
+                "source": "Raw",
+                "title": _field(card.get("name"), "Unknown"),
+                "set": _field(card.get("set"), "Unknown"),
+                "grade": "Raw",
+                "cardgrade": "",
+                "brand": "",
+                "type": _field(card.get("type")),
+                "market": _price(card.get("price")),
+                "sell_price": _price(card.get("sell_price")),
+                "image_link": _image(card.get("image_link")),
+                "link": card.get("link_on_tcg_player", ""),
+            })
+
+    if slabs_df is not None and not slabs_df.empty:
+        for slab in slabs_df.to_dict("records"):
+            items.append({
+                "source": "Slab",
+                "title": _field(slab.get("subject"), "Unknown"),
+                "set": _field(slab.get("set"), "Unknown"),
+                "grade": _grade_facet(slab),
+                "cardgrade": _field(slab.get("cardgrade")),
+                "brand": _field(slab.get("brand")),
+                "type": _field(slab.get("type")),
+                "market": _price(slab.get("raw")),
+                "sell_price": _price(slab.get("sell_price")),
+                "image_link": _image(slab.get("image_link")),
+                "link": slab.get("link", ""),
+            })
+
+    # token -> {item_id: weight}
+    postings = {}
+    # facet -> value -> {item_id}
+    facets = {facet: {} for facet in SEARCH_FACETS}
+
+    for item_id, item in enumerate(items):
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            for token in tokenize(item[field]):
+                bucket = postings.setdefault(token, {})
+                bucket[item_id] = bucket.get(item_id, 0) + weight
+        for facet in SEARCH_FACETS:
+            facets[facet].setdefault(item[facet], set()).add(item_id)
+
+    return {
+        "items": items,
+        "postings": postings,
+        "vocab": sorted(postings),
+        "facets": facets,
+    }
+
+
+def _expand_token(vocab, token):
+    # Every indexed term starting with `token` ("chari" -> "charizard")
+    start = bisect_left(vocab, token)
+    end = bisect_left(vocab, token + "{")  # "{" sorts after a-z and 0-9
+    return vocab[start:end]
+
+
+def match_query(index, query):
+    """Return {item_id: score} for items matching every query token."""
+    query_tokens = tokenize(query)
+    if not query_tokens:
+        return dict.fromkeys(range(len(index["items"])), 0)
+
+    postings = index["postings"]
+    scores = None
+    for token in query_tokens:
+        token_scores = {}
+        for term in _expand_token(index["vocab"], token):
+            # Exact token hits rank above prefix hits
+            boost = 2 if term == token else 1
+            for item_id, weight in postings[term].items():
+                token_scores[item_id] = max(token_scores.get(item_id, 0), weight * boost)
+
+        if scores is None:
+            scores = token_scores
+        else:
+            scores = {
+                item_id: score + token_scores[item_id]
+                for item_id, score in scores.items()
+                if item_id in token_scores
+            }
+        if not scores:
+            break
+
+    return scores
+
+
+def facet_counts(index, facet, item_ids):
+    return {
+        value: len(ids & item_ids)
+        for value, ids in index["facets"][facet].items()
+    }
+
+
+def filter_facet(index, item_ids, facet, selected):
+    if not selected:
+        return item_ids
+    allowed = set()
+    for value in selected:
+        allowed |= index["facets"][facet].get(value, set())
+    return item_ids & allowed
+
+
+def rank_results(index, scores, item_ids):
+    items = index["items"]
+    ranked = sorted(item_ids, key=lambda i: (-scores[i], items[i]["title"].lower()))
+    return [items[i] for i in ranked]
+
 # -----------------------------------------------------
 # DISPLAY CARDS (GRID VIEW)
 # -----------------------------------------------------
@@ -167,17 +506,42 @@ def display_slabs(slabs_df):
 
     # Filters
     st.markdown("### 🔍 Filters")
-    unique_grades = sorted(slabs_df["cardgrade"].dropna().unique())
+    slab_index = build_slab_index(slabs_df)
     unique_brands = sorted(slabs_df["brand"].dropna().unique())
 
     selected_brand = st.selectbox("Brand", ["All"] + unique_brands)
-    selected_grade = st.selectbox("Grade", ["All"] + unique_grades)
-
-    filtered = slabs_df.copy()
+    exclude_qualified = st.checkbox("Exclude qualified grades (OC, ST, PD, OF, MK, MC)")
+
+    full_ranges = {"grade_num": (1.0, 10.0)}
+    grade_range = st.slider("Grade", 1.0, 10.0, full_ranges["grade_num"], step=0.5)
+
+    prices = slab_index["sell_price"]["values"]
+    if len(prices):
+        full_ranges["sell_price"] = (float(np.floor(prices[0])), float(np.ceil(prices[-1])))
+    else:
+        full_ranges["sell_price"] = (0.0, 0.0)
+    price_range = full_ranges["sell_price"]
+    if price_range[1] > price_range[0]:
+        price_range = st.slider("My Price ($)", *full_ranges["sell_price"], full_ranges["sell_price"], step=1.0)
+
+    sort = st.selectbox(
+        "Sort", ["Price High→Low", "Price Low→High", "Grade High→Low", "Grade Low→High"]
+    )
+    sort_col = "grade_num" if sort.startswith("Grade") else "sell_price"
+
+    positions = slab_positions(
+        slab_index,
+        {"grade_num": grade_range, "sell_price": price_range},
+        full_ranges,
+        sort_col,
+        descending=sort.endswith("High→Low"),
+    )
+
+    filtered = slabs_df.iloc[positions]
     if selected_brand != "All":
         filtered = filtered[filtered["brand"] == selected_brand]
-    if selected_grade != "All":
-        filtered = filtered[filtered["cardgrade"] == selected_grade]
+    if exclude_qualified:
+        filtered = filtered[filtered["grade_qualifier"] == ""]
 
     st.markdown(f"### 📦 Showing {len(filtered)} slabs")
 
@@ -203,18 +567,96 @@ def display_slabs(slabs_df):
                 if isinstance(link, str) and link.startswith("http"):
                     st.link_button("🔗 Listing", link)
 
+# -----------------------------------------------------
+# DISPLAY SEARCH (RAW CARDS + SLABS)
+# -----------------------------------------------------
+def display_search(cards_df, slabs_df):
+    st.markdown("## 🔎 Search All Inventory")
+
+    index = build_search_index(cards_df, slabs_df)
+    if not index["items"]:
+        st.warning("No inventory data available.")
+        return
+
+    query = st.text_input("Search", placeholder="Name, set, brand or grade")
+    scores = match_query(index, query)
+    matched = set(scores)
+
+    # Facets drill down: set counts reflect the query, grade counts
+    # reflect the query and the chosen sets
+    st.markdown("### 🔍 Filters")
+    set_counts = facet_counts(index, "set", matched)
+    selected_sets = st.multiselect(
+        "Set",
+        sorted(index["facets"]["set"]),
+        format_func=lambda v: f"{v} ({set_counts.get(v, 0)})",
+    )
+    matched = filter_facet(index, matched, "set", selected_sets)
+
+    grade_counts = facet_counts(index, "grade", matched)
+    selected_grades = st.multiselect(
+        "Grade",
+        sorted(index["facets"]["grade"]),
+        format_func=lambda v: f"{v} ({grade_counts.get(v, 0)})",
+    )
+    matched = filter_facet(index, matched, "grade", selected_grades)
+
+    results = rank_results(index, scores, matched)
+    max_results = 60
+    shown = results[:max_results]
+
+    if len(results) > max_results:
+        st.markdown(f"### 📦 Showing top {max_results} of {len(results)} results")
+    else:
+        st.markdown(f"### 📦 Showing {len(results)} results")
+
+    # GRID DISPLAY
+    cols_per_row = 3
+    rows = (len(shown) + cols_per_row - 1) // cols_per_row
+
+    for i in range(rows):
+        row_items = shown[i * cols_per_row: (i+1) * cols_per_row]
+        cols = st.columns(cols_per_row)
+
+        for col, item in zip(cols, row_items):
+            with col:
+                st.image(item["image_link"], width=180)
+                st.markdown(f"**{item['title']}**")
+                if item["source"] == "Slab":
+                    st.write(f"🏅 {item['grade']}")
+                else:
+                    st.write("🃏 Raw")
+                st.write(f"Set: {item['set']}")
+                st.markdown(f"**Market Raw:** ${item['market']:,.2f}")
+                st.markdown(f"**My Price:** ${item['sell_price']:,.2f}")
+
+                link = item["link"]
+                if isinstance(link, str) and link.startswith("http"):
+                    label = "🔗 Listing" if item["source"] == "Slab" else "🔗 TCGPlayer"
+                    st.link_button(label, link)
+
 # -----------------------------------------------------
 # MAIN APP
 # -----------------------------------------------------
-st.title("📘 Card & Slab Inventory")
+# Only render when run directly (`streamlit run cards_tab.py`), so the
+# display functions can be imported by other pages
+def main():
+    st.title("📘 Card & Slab Inventory")
+
+    tabs = ["Raw Cards", "Graded Slabs", "Search All"]
+    choice = st.radio("Select a category:", tabs)
+
+    if choice == "Raw Cards":
+        cards_df = load_cards()
+        display_cards(cards_df)
+
+    elif choice == "Graded Slabs":
+        slabs_df = load_slabs()
+        display_slabs(slabs_df)
 
-tabs = ["Raw Cards", "Graded Slabs"]
-choice = st.radio("Select a category:", tabs)
+    elif choice == "Search All":
+        display_search(load_cards(), load_slabs())
 
-if choice == "Raw Cards":
-    cards_df = load_cards()
-    display_cards(cards_df)
 
-elif choice == "Graded Slabs":
-    slabs_df = load_slabs()
-    display_slabs(slabs_df)
+if __name__ == "__main__":
+    main()
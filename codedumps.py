@@ -1,7 +1,5 @@
 import streamlit as st
 import pandas as pd
-from cards_tab import display_cards_tab
-from slabs_tab import display_slabs_tab
 
 # Load Google Sheets CSV
 def load_google_sheet(csv_url):
@@ -86,11 +84,14 @@ tabs = [
 
 selected_tab = st.radio("Select a section:", tabs)
 
+# Imported on demand so only the selected section pays for it
 if selected_tab == "🔹 Card Inventory":
-    display_cards_tab(cards_df)
+    from cards_tab import display_cards, prepare_cards
+    display_cards(prepare_cards(cards_df.copy()))
 
 elif selected_tab == "📦 Slabs & Graded Cards":
-    display_slabs_tab(slabs_df)
+    from cards_tab import display_slabs, prepare_slabs
+    display_slabs(prepare_slabs(slabs_df.copy()))
 
 import streamlit as st
 import pandas as pd
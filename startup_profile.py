@@ -0,0 +1,143 @@
+"""
+Startup timing for streamlit_app.py.
+
+Set POIBUNNY_PROFILE_STARTUP=1 to time each startup phase and each
+lazily imported module. The report is shown at the bottom of the page
+and the first (cold) run of each process is appended to
+POIBUNNY_PROFILE_LOG (default: startup_profile.jsonl) as one JSON line,
+so cold starts can be compared release over release. Tag runs with
+POIBUNNY_RELEASE.
+
+`python startup_profile.py` prints a per-module import report for the
+app's dependencies using `python -X importtime`.
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("POIBUNNY_PROFILE_STARTUP") == "1"
+LOG_PATH = os.environ.get("POIBUNNY_PROFILE_LOG", "startup_profile.jsonl")
+RELEASE = os.environ.get("POIBUNNY_RELEASE", "dev")
+
+# Modules streamlit_app.py pulls in, in the order it needs them
+APP_MODULES = ["streamlit", "pandas"]
+
+# Streamlit runs each session's script in its own thread, so per-run
+# state lives in a thread-local; only the cold-start flag is shared
+_run = threading.local()
+_lock = threading.Lock()
+_started = False
+
+
+# -----------------------------------------------------
+# RECORDING
+# -----------------------------------------------------
+def start_run():
+    """Reset timings; call at the top of every script run."""
+    global _started
+    with _lock:
+        _run.cold = not _started
+        _started = True
+    _run.start = time.perf_counter()
+    _run.timings = []
+
+
+def _record(kind, name, start):
+    timings = getattr(_run, "timings", None)
+    if timings is not None:
+        timings.append({"kind": kind, "name": name, "ms": (time.perf_counter() - start) * 1000})
+
+
+@contextmanager
+def phase(name):
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record("phase", name, start)
+
+
+def timed_import(name):
+    """Import `name`, recording how long it took if it wasn't loaded yet."""
+    if not ENABLED or name in sys.modules:
+        return importlib.import_module(name)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _record("module", name, start)
+    return module
+
+
+# -----------------------------------------------------
+# REPORTING
+# -----------------------------------------------------
+def report():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "release": RELEASE,
+        "cold": _run.cold,
+        "total_ms": (time.perf_counter() - _run.start) * 1000,
+        "timings": list(_run.timings),
+    }
+
+
+def write_report():
+    """
+    Return this run's report (None when disabled). Only cold runs are
+    appended to LOG_PATH; widget reruns would bury them otherwise.
+    """
+    if not ENABLED:
+        return None
+    record = report()
+    if not record["cold"]:
+        return record
+    try:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        # Read-only filesystem on some hosts; the in-page report still works
+        pass
+    return record
+
+
+def import_times(modules=APP_MODULES):
+    """Cumulative import time (ms) per top-level package in a fresh interpreter."""
+    # Modules the interpreter loads before any script runs (site,
+    # encodings, ...) aren't the app's cost, so they're left out
+    interpreter = _top_level_import_times("pass")
+    times = _top_level_import_times("; ".join(f"import {m}" for m in modules))
+    return {name: ms for name, ms in times.items() if name not in interpreter}
+
+
+def _top_level_import_times(code):
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+
+    # Lines look like "import time:       412 |      18934 | pandas", with
+    # nested imports indented two spaces per level; keep the top level only
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+if __name__ == "__main__":
+    times = import_times(sys.argv[1:] or APP_MODULES)
+    for name, ms in sorted(times.items(), key=lambda item: item[1], reverse=True)[:25]:
+        print(f"{ms:10.1f} ms  {name}")
+    print(f"{sum(times.values()):10.1f} ms  total (top-level packages)")
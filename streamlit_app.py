@@ -1,19 +1,31 @@
-import streamlit as st
-import pandas as pd
 import re
-import requests
-import subprocess
+
+import streamlit as st
+
+import startup_profile
+from startup_profile import phase, timed_import
+
+startup_profile.start_run()
+
+# ------------------- SKELETON -------------------
+# Draw the page frame before any data or heavy imports so the first
+# paint doesn't wait on the sheet download
+st.markdown("## ⭐ Featured Cards")
+featured_slot = st.empty()
+featured_slot.info("Loading inventory…")
 
 # ------------------- CONFIG & SECRETS -------------------
-required_keys = ["google_sheets", "admin", "psa"]
-for key in required_keys:
-    if key not in st.secrets:
-        st.error(f"Missing secrets section: [{key}]")
+def require_secret(section, key):
+    if section not in st.secrets:
+        st.error(f"Missing secrets section: [{section}]")
         st.stop()
+    return st.secrets[section][key]
 
-ADMIN_PASSWORD = st.secrets["admin"]["password"]
-PSA_API_TOKEN = st.secrets["psa"]["api_token"]
-CARDS_SHEET_URL = st.secrets["google_sheets"]["cards_sheet_url"]
+with phase("secrets"):
+    CARDS_SHEET_URL = require_secret("google_sheets", "cards_sheet_url")
+
+with phase("import pandas"):
+    pd = timed_import("pandas")
 
 # ------------------- HELPERS -------------------
 def load_google_sheet(csv_url):
@@ -32,6 +44,19 @@ def clean_price(value):
 def make_safe_key(name):
     return re.sub(r"[^a-z0-9_]+", "_", name.lower())
 
+def _save_widget_state(key):
+    st.session_state[f"saved_{key}"] = st.session_state[key]
+
+def persistent(key, options=None):
+    # Streamlit drops a widget's state on runs where it isn't drawn (e.g.
+    # another section is selected), so mirror it under a plain key and
+    # restore it when the widget comes back
+    saved = f"saved_{key}"
+    if key not in st.session_state and saved in st.session_state:
+        if options is None or st.session_state[saved] in options:
+            st.session_state[key] = st.session_state[saved]
+    return {"key": key, "on_change": _save_widget_state, "args": (key,)}
+
 # ------------------- LOAD DATA -------------------
 @st.cache_data
 def load_cards():
@@ -43,43 +68,48 @@ def load_cards():
     df["name"] = df.get("name", "Unknown").astype(str).fillna("Unknown")
     return df
 
-cards_df = load_cards()
+with phase("load cards"):
+    cards_df = load_cards()
 
 # ------------------- FEATURED CARDS -------------------
-st.markdown("## ⭐ Featured Cards")
-
-if not cards_df.empty:
-    temp_df = cards_df.copy()
-    temp_df["market_price_clean"] = pd.to_numeric(temp_df.get("sell_price", 0), errors="coerce").fillna(0)
-
-    weights = None
-    if temp_df["market_price_clean"].sum() > 0:
-        weights = temp_df["market_price_clean"] + 1
-        weights = weights / weights.sum()
-
-    featured_count = min(3, len(temp_df))
-    featured_cards = temp_df.sample(n=featured_count, weights=weights, replace=False)
-
-    left_spacer, col1, col2, col3, right_spacer = st.columns([1, 2, 2, 2, 1])
-    cols = [col1, col2, col3]
-
-    for idx, (_, row) in enumerate(featured_cards.iterrows()):
-        with cols[idx]:
-            image_url = row.get("image_link")
-            if pd.isna(image_url) or not image_url:
-                image_url = "https://via.placeholder.com/150"
-            st.image(image_url, width="stretch")
-
-            market = pd.to_numeric(row.get("market_price", 0), errors="coerce") or 0
-            sell = pd.to_numeric(row.get("sell_price", 0), errors="coerce") or 0
-
-            st.markdown(
-                f"**{row.get('name','Unknown')}**  \n"
-                f"{row.get('set','Unknown')}  \n"
-                f"Market: ${market:,.2f} | Sell Price: ${sell:,.2f}"
-            )
-else:
-    st.warning("No cards found in sheet.")
+with featured_slot.container(), phase("featured cards"):
+    if not cards_df.empty:
+        temp_df = cards_df.copy()
+        temp_df["market_price_clean"] = pd.to_numeric(temp_df.get("sell_price", 0), errors="coerce").fillna(0)
+
+        weights = None
+        if temp_df["market_price_clean"].sum() > 0:
+            weights = temp_df["market_price_clean"] + 1
+            weights = weights / weights.sum()
+
+        # Sample once per session so switching sections doesn't reshuffle
+        featured_index = st.session_state.get("featured_index")
+        if featured_index is None or not set(featured_index) <= set(temp_df.index):
+            featured_count = min(3, len(temp_df))
+            featured_index = list(temp_df.sample(n=featured_count, weights=weights, replace=False).index)
+            st.session_state["featured_index"] = featured_index
+        featured_cards = temp_df.loc[featured_index]
+
+        left_spacer, col1, col2, col3, right_spacer = st.columns([1, 2, 2, 2, 1])
+        cols = [col1, col2, col3]
+
+        for idx, (_, row) in enumerate(featured_cards.iterrows()):
+            with cols[idx]:
+                image_url = row.get("image_link")
+                if pd.isna(image_url) or not image_url:
+                    image_url = "https://via.placeholder.com/150"
+                st.image(image_url, width="stretch")
+
+                market = pd.to_numeric(row.get("market_price", 0), errors="coerce") or 0
+                sell = pd.to_numeric(row.get("sell_price", 0), errors="coerce") or 0
+
+                st.markdown(
+                    f"**{row.get('name','Unknown')}**  \n"
+                    f"{row.get('set','Unknown')}  \n"
+                    f"Market: ${market:,.2f} | Sell Price: ${sell:,.2f}"
+                )
+    else:
+        st.warning("No cards found in sheet.")
 
 # ------------------- DYNAMIC TABS -------------------
 predefined_types = ["Pokemon - English", "Pokemon - Japanese"]
@@ -91,14 +121,22 @@ if other_types_exist:
     tabs_labels.append("Others")
 tabs_labels.append("Admin Panel")
 
-tabs = st.tabs(tabs_labels)
-
-for idx, t in enumerate(tabs_labels):
-    with tabs[idx]:
-        if t == "Admin Panel":
-            st.header("Admin Panel")
+# st.tabs runs every tab's code on each rerun; a selector lets us build
+# only the grid that's actually on screen
+selected_tab = st.radio("Section", tabs_labels, horizontal=True, label_visibility="collapsed")
+
+t = selected_tab
+with phase(f"tab: {t}"):
+    if t == "Admin Panel":
+        st.header("Admin Panel")
+        # Only the admin panel needs these, so they're checked here
+        # rather than blocking every page load
+        missing = [key for key in ["admin", "psa"] if key not in st.secrets]
+        if missing:
+            st.error(f"Missing secrets section: [{missing[0]}]")
+        else:
             password = st.text_input("Admin Password", type="password")
-            if password == ADMIN_PASSWORD:
+            if password == st.secrets["admin"]["password"]:
                 st.success("Access granted")
                 st.dataframe(cards_df)
 
@@ -111,6 +149,8 @@ for idx, t in enumerate(tabs_labels):
                         st.warning("Please enter a certificate number")
                     else:
                         try:
+                            import subprocess
+                            PSA_API_TOKEN = st.secrets["psa"]["api_token"]
                             curl_command = f'''curl -X GET "https://api.psacard.com/publicapi/cert/GetByCertNumber/{cert_number}" \
 -H "Content-Type: application/json" \
 -H "Authorization: bearer {PSA_API_TOKEN}"'''
@@ -124,8 +164,7 @@ for idx, t in enumerate(tabs_labels):
                                 st.code(result.stderr)
                         except Exception as e:
                             st.error(f"An error occurred: {e}")
-            continue  # Skip the rest of loop for Admin Panel
-
+    else:
         # Filter cards for this tab
         if t == "Others":
             df = cards_df[~cards_df["type"].isin(predefined_types) & (cards_df["quantity"] > 0)]
@@ -134,49 +173,55 @@ for idx, t in enumerate(tabs_labels):
 
         if df.empty:
             st.info("No cards available")
-            continue
-
-        safe_t = make_safe_key(t)
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            selected_set = st.selectbox(
-                "Set", ["All"] + sorted(df["set"].dropna().unique()), key=f"set_{safe_t}"
-            )
-        with col2:
-            search = st.text_input("Search Name", key=f"search_{safe_t}")
-        with col3:
-            sort = st.selectbox(
-                "Sort", ["Name (A-Z)", "Price Low→High", "Price High→Low"], key=f"sort_{safe_t}"
-            )
-
-        if selected_set != "All":
-            df = df[df["set"] == selected_set]
-        if search:
-            df = df[df["name"].str.contains(search, case=False, na=False)]
-        if sort == "Name (A-Z)":
-            df = df.sort_values("name")
-        elif sort == "Price Low→High":
-            df = df.sort_values("market_price_clean")
         else:
-            df = df.sort_values("market_price_clean", ascending=False)
-
-        # Display cards in a 3-column grid
-        for i in range(0, len(df), 3):
-            cols = st.columns(3)
-            for j, card in enumerate(df.iloc[i:i+3].to_dict("records")):
-                with cols[j]:
-                    image_url = card.get("image_link")
-                    if pd.isna(image_url) or not image_url:
-                        image_url = "https://via.placeholder.com/150"
-                    st.image(image_url, width="stretch")
-
-                    quantity = int(card.get("quantity", 0) or 0)
-                    sell_price = clean_price(card.get("sell_price"))
-                    market_price = clean_price(card.get("market_price"))
-
-                    st.markdown(
-                        f"**{card.get('name','Unknown')}**  \n"
-                        f"{card.get('set','')}  \n"
-                        f"Qty: {quantity}  \n"
-                        f"Sell: ${sell_price:,.2f} | Market: ${market_price:,.2f}"
-                    )
+            safe_t = make_safe_key(t)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                set_options = ["All"] + sorted(df["set"].dropna().unique())
+                selected_set = st.selectbox(
+                    "Set", set_options, **persistent(f"set_{safe_t}", set_options)
+                )
+            with col2:
+                search = st.text_input("Search Name", **persistent(f"search_{safe_t}"))
+            with col3:
+                sort = st.selectbox(
+                    "Sort", ["Name (A-Z)", "Price Low→High", "Price High→Low"], **persistent(f"sort_{safe_t}")
+                )
+
+            if selected_set != "All":
+                df = df[df["set"] == selected_set]
+            if search:
+                df = df[df["name"].str.contains(search, case=False, na=False)]
+            if sort == "Name (A-Z)":
+                df = df.sort_values("name")
+            elif sort == "Price Low→High":
+                df = df.sort_values("market_price_clean")
+            else:
+                df = df.sort_values("market_price_clean", ascending=False)
+
+            # Display cards in a 3-column grid
+            for i in range(0, len(df), 3):
+                cols = st.columns(3)
+                for j, card in enumerate(df.iloc[i:i+3].to_dict("records")):
+                    with cols[j]:
+                        image_url = card.get("image_link")
+                        if pd.isna(image_url) or not image_url:
+                            image_url = "https://via.placeholder.com/150"
+                        st.image(image_url, width="stretch")
+
+                        quantity = int(card.get("quantity", 0) or 0)
+                        sell_price = clean_price(card.get("sell_price"))
+                        market_price = clean_price(card.get("market_price"))
+
+                        st.markdown(
+                            f"**{card.get('name','Unknown')}**  \n"
+                            f"{card.get('set','')}  \n"
+                            f"Qty: {quantity}  \n"
+                            f"Sell: ${sell_price:,.2f} | Market: ${market_price:,.2f}"
+                        )
+
+# ------------------- STARTUP PROFILE -------------------
+profile = startup_profile.write_report()
+if profile:
+    with st.expander(f"⏱ Startup profile ({profile['total_ms']:,.0f} ms, {'cold' if profile['cold'] else 'warm'})"):
+        st.dataframe(pd.DataFrame(profile["timings"]))
@@ -0,0 +1,149 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cards_tab import (
+    build_search_index,
+    build_slab_index,
+    match_query,
+    parse_grade,
+    parse_grade_qualifier,
+    slab_positions,
+)
+
+
+# -----------------------------------------------------
+# PARSE GRADE
+# -----------------------------------------------------
+@pytest.mark.parametrize("value, brand, expected", [
+    ("PSA 10", "PSA", 10.0),
+    ("GEM MT 10", "PSA", 10.0),
+    ("BGS 9.5", "BGS", 9.5),
+    ("CGC 9.8", "CGC", 9.8),
+    ("8,5", "PSA", 8.5),
+    ("10.0", "PSA", 10.0),
+    ("MINT 9 (OC)", "PSA", 9.0),
+    ("BGS 9.5 (9.5, 10, 9, 9.5)", "BGS", 9.5),
+    (10, "PSA", 10.0),
+    (9.5, "BGS", 9.5),
+    ("12", "PSA", 10.0),
+])
+def test_parse_grade_numbers(value, brand, expected):
+    assert parse_grade(value, brand) == expected
+
+
+@pytest.mark.parametrize("value, brand, expected", [
+    ("Gem Mint", "PSA", 10.0),
+    ("Gem Mint", "BGS", 9.5),
+    ("Gem Mint", "CGC", 9.5),
+    ("Gem Mint", "Beckett", 9.5),
+    ("BGS Gem Mint", None, 9.5),
+    ("Gem Mint", None, 10.0),
+    ("Black Label", "BGS", 10.0),
+    ("Perfect", "CGC", 10.0),
+    ("Mint+", "CGC", 9.5),
+    ("Mint", "CGC", 9.0),
+    ("NM-MT+", "BGS", 8.5),
+    ("NM-MT", "PSA", 8.0),
+    ("NM", "PSA", 7.0),
+])
+def test_parse_grade_labels(value, brand, expected):
+    assert parse_grade(value, brand) == expected
+
+
+@pytest.mark.parametrize("value", [None, np.nan, "", "Authentic", "Altered"])
+def test_parse_grade_missing(value):
+    assert math.isnan(parse_grade(value, "PSA"))
+
+
+def test_parse_grade_qualifier():
+    assert parse_grade_qualifier("MINT 9 (OC)") == "OC"
+    assert parse_grade_qualifier("PSA 8 ST") == "ST"
+    assert parse_grade_qualifier("PSA 10") == ""
+    assert parse_grade_qualifier(np.nan) == ""
+
+
+# -----------------------------------------------------
+# SLAB POSITIONS
+# -----------------------------------------------------
+@pytest.fixture
+def slabs_df():
+    return pd.DataFrame({
+        "grade_num": [10.0, 9.5, np.nan, 8.0, 10.0, 9.0],
+        "sell_price": [600.0, 250.0, 30.0, np.nan, 300.0, 90.0],
+    })
+
+
+FULL = {"grade_num": (1.0, 10.0), "sell_price": (0.0, 600.0)}
+
+
+def test_full_ranges_keep_missing_rows_last(slabs_df):
+    index = build_slab_index(slabs_df)
+    positions = slab_positions(index, FULL, FULL, "sell_price", descending=True)
+    assert list(positions) == [0, 4, 1, 5, 2, 3]
+
+
+def test_narrowed_sort_column_drops_missing(slabs_df):
+    index = build_slab_index(slabs_df)
+    ranges = {"grade_num": (9.0, 10.0), "sell_price": FULL["sell_price"]}
+    positions = slab_positions(index, ranges, FULL, "grade_num", descending=False)
+    assert list(positions) == [5, 1, 0, 4]
+
+
+def test_narrowed_other_column_filters_missing(slabs_df):
+    index = build_slab_index(slabs_df)
+    ranges = {"grade_num": (9.5, 10.0), "sell_price": FULL["sell_price"]}
+    positions = slab_positions(index, ranges, FULL, "sell_price", descending=True)
+    assert list(positions) == [0, 4, 1]
+
+
+@pytest.mark.parametrize("sort_col", ["grade_num", "sell_price"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_both_ranges_match_full_scan(sort_col, descending):
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        "grade_num": rng.choice([1.0, 5.0, 8.0, 9.0, 9.5, 10.0, np.nan], n),
+        "sell_price": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 1000, n).astype(float)),
+    })
+    full = {"grade_num": (1.0, 10.0), "sell_price": (0.0, 999.0)}
+    index = build_slab_index(df)
+
+    # Wide grade range + narrow price range and the reverse, so both
+    # sides of the intersection get exercised
+    for ranges in [
+        {"grade_num": (5.0, 10.0), "sell_price": (100.0, 150.0)},
+        {"grade_num": (9.5, 10.0), "sell_price": (50.0, 900.0)},
+    ]:
+        positions = slab_positions(index, ranges, full, sort_col, descending)
+
+        mask = df["grade_num"].between(*ranges["grade_num"]) & df["sell_price"].between(*ranges["sell_price"])
+        expected = df[mask][sort_col].sort_values(ascending=not descending)
+        assert sorted(positions) == sorted(expected.index)
+        assert list(df[sort_col].to_numpy()[positions]) == list(expected)
+
+
+# -----------------------------------------------------
+# SEARCH INDEX
+# -----------------------------------------------------
+def test_grade_facet_groups_equivalent_grade_strings():
+    cards_df = pd.DataFrame({"name": ["Pikachu"], "set": ["Jungle"], "price": [5.0], "sell_price": [6.0]})
+    slabs_df = pd.DataFrame({
+        "subject": ["Charizard", "Blastoise", "Venusaur", "Mew"],
+        "brand": ["PSA", "PSA", "PSA", "PSA"],
+        "cardgrade": ["PSA 10", "PSA 10 GEM MT", "GEM MT 10", "Authentic"],
+        "raw": ["$50", np.nan, 10.0, 1.0],
+        "sell_price": [600.0, np.nan, 300.0, 20.0],
+    })
+    index = build_search_index(cards_df, slabs_df)
+
+    assert {value: len(ids) for value, ids in index["facets"]["grade"].items()} == {
+        "Raw": 1,
+        "PSA 10": 3,
+        "PSA Authentic": 1,
+    }
+    # Raw grade strings stay searchable, and bad prices fall back to numbers
+    assert len(match_query(index, "gem")) == 2
+    assert [item["market"] for item in index["items"]][1:3] == [50.0, 0.0]